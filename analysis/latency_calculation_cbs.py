@@ -13,8 +13,285 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 ################################################################################################
 
+import copy
+import functools
 from math import floor, ceil
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional, fall back to plain Python
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+
+__all__ = ["NUMBA_AVAILABLE", "RESULT_KEYS", "RESULT_INDEX", "CBSLatencyCalculator"]
+
+# names of the formulas in the order of the result arrays
+RESULT_KEYS = (
+    "baStandard",
+    "qStandardL3V1",
+    "qStandardL3V2",
+    "plenary100Mbit",
+    "plenaryFasterMedia",
+    "plenaryFasterMediaV2",
+    "qStandardL3V3",
+)
+RESULT_INDEX = {key: index for index, key in enumerate(RESULT_KEYS)}
+
+
+@njit(cache=True)
+def _baStandard(idleSlope, streamMaxFrame, linkspeed, invLinkspeed, cmiPerLinkspeed, ifg, tMaxFrame):
+    """
+    Queue delay of baStandard in seconds, see CBSLatencyCalculator.baStandard
+    """
+    tClassA = max((idleSlope * cmiPerLinkspeed - streamMaxFrame * invLinkspeed) * linkspeed / idleSlope, 0.0)
+    return tMaxFrame + tClassA + (streamMaxFrame - ifg) * invLinkspeed
+
+
+@njit(cache=True)
+def _qStandardL3V1FanIn(idleSlope, nrInputLinks, linkspeed, ctMaxFrame, classMaxFrame):
+    """
+    Fan-in data of qStandardL3V1 in bits, see CBSLatencyCalculator.qStandardL3V1
+    """
+    fan_in_data = 0.0
+    B0 = idleSlope
+    # we assume that the first link has everything
+    for i in range(nrInputLinks):
+        if B0 > 0:
+            Bi = idleSlope
+            W = linkspeed - max(B0, Bi)
+            fan_in_data += ctMaxFrame * idleSlope * linkspeed / (W * linkspeed) + classMaxFrame * linkspeed / W
+            B0 -= Bi
+        else:
+            fan_in_data += classMaxFrame
+    return fan_in_data
+
+
+@njit(cache=True)
+def _qStandardL3V2FanIn(idleSlope, inputIdleSlopes, linkspeed, ctMaxFrame, classMaxFrame):
+    """
+    Fan-in data of qStandardL3V2 in bits, see CBSLatencyCalculator.qStandardL3V2
+    """
+    fan_in_data = 0.0
+    B0 = idleSlope
+    # fan_in_data += ctMaxFrame * idleSlope * linkspeed / (W * linkspeed) + classMaxFrame * linkspeed / W
+    # both terms share W, so the loop invariant numerator is summed once and divided once per input
+    burstData = ctMaxFrame * idleSlope + classMaxFrame * linkspeed
+    for i in range(inputIdleSlopes.shape[0]):
+        Bi = inputIdleSlopes[i]
+        if B0 > 0:
+            W = linkspeed - max(B0, Bi)
+            fan_in_data += burstData / W
+            B0 -= Bi
+        else:
+            fan_in_data += classMaxFrame
+    return fan_in_data
+
+
+@njit(cache=True)
+def _qStandardL3V1(idleSlope, classMaxFrame, nrInputLinks, linkspeed, invLinkspeed, ctMaxFrame, tMaxFrame):
+    """
+    Queue delay of qStandardL3V1 in seconds, see CBSLatencyCalculator.qStandardL3V1
+    """
+    fan_in_data = _qStandardL3V1FanIn(idleSlope, nrInputLinks, linkspeed, ctMaxFrame, classMaxFrame)
+    return tMaxFrame + fan_in_data * invLinkspeed + classMaxFrame * invLinkspeed
+
+
+@njit(cache=True)
+def _qStandardL3V2(idleSlope, classMaxFrame, inputIdleSlopes, linkspeed, invLinkspeed, ctMaxFrame, tMaxFrame):
+    """
+    Queue delay of qStandardL3V2 in seconds, see CBSLatencyCalculator.qStandardL3V2
+    """
+    fan_in_delay = _qStandardL3V2FanIn(idleSlope, inputIdleSlopes, linkspeed, ctMaxFrame, classMaxFrame) * invLinkspeed
+    # the permanently buffered data equals the worst-case fan-in data
+    return tMaxFrame + fan_in_delay + fan_in_delay
+
+
+@njit(cache=True)
+def _plenary100Mbit(cmi, idleSlope, streamMaxFrame, nrInputLinks, invLinkspeed, ctMaxFrame, minFrame):
+    """
+    Queue delay of plenary100Mbit in seconds, see CBSLatencyCalculator.plenary100Mbit
+    """
+    maxReserved = floor(cmi * idleSlope)
+    excess = maxReserved - streamMaxFrame
+    # floor and ceil of the bit quotients as floor divisions, -(-a // b) == ceil(a / b)
+    N = min(nrInputLinks - 1, excess // minFrame)
+    otherPackets = 0.0
+    if N > 0:
+        otherPackets = 2 * excess + (-excess // N)
+    return (ctMaxFrame + otherPackets + streamMaxFrame) * invLinkspeed
+
+
+@njit(cache=True)
+def _plenaryFasterMediaV2(cmi, idleSlope, streamMaxFrame, linkspeed, invLinkspeed, ctMaxFrame, tMaxFrame):
+    """
+    Queue delay of plenaryFasterMediaV2 in seconds, see CBSLatencyCalculator.plenaryFasterMediaV2
+    """
+    maxReserved = floor(cmi * idleSlope)
+    N = linkspeed / 100000000
+    streamBits = max(ceil((maxReserved - streamMaxFrame) / N), 0)
+    sendSlope = idleSlope - linkspeed
+    loCredit = streamBits * sendSlope * invLinkspeed
+    hiCredit = ctMaxFrame * idleSlope * invLinkspeed
+    maxBurstSize = linkspeed * (loCredit - hiCredit) / sendSlope
+    maxBurstTime = (loCredit - hiCredit) / sendSlope
+    totalBitsQueued = N * maxBurstSize + floor(maxBurstTime / cmi) * streamMaxFrame
+    return (totalBitsQueued / idleSlope) - (maxBurstTime - (streamBits * invLinkspeed)) + tMaxFrame
+
+
+@njit(parallel=True, cache=True)
+def _analyzeAllPorts(
+    idleSlope,
+    streamMaxFrame,
+    classMaxFrame,
+    nrInputLinks,
+    inputIdleSlopesSorted,
+    nrInputs,
+    linkspeed,
+    invLinkspeed,
+    cmi,
+    cmiPerLinkspeed,
+    ifg,
+    ctMaxFrame,
+    minFrame,
+    tMaxFrame,
+):
+    """
+    Results of all formulas for N ports, see CBSLatencyCalculator.runAlgorithmsForPortsBatch.
+    The ports are independent, so they are distributed over all cores.
+    Row k of the returned (7, N) array holds the results of the formula RESULT_KEYS[k].
+    """
+    nPorts = idleSlope.shape[0]
+    results = np.empty((7, nPorts))
+    for i in prange(nPorts):
+        inputs = inputIdleSlopesSorted[i, : nrInputs[i]]
+        results[0, i] = _baStandard(
+            idleSlope[i], streamMaxFrame[i], linkspeed, invLinkspeed, cmiPerLinkspeed, ifg, tMaxFrame
+        )
+        results[1, i] = _qStandardL3V1(
+            idleSlope[i], classMaxFrame[i], nrInputLinks[i], linkspeed, invLinkspeed, ctMaxFrame, tMaxFrame
+        )
+        results[2, i] = _qStandardL3V2(
+            idleSlope[i], classMaxFrame[i], inputs, linkspeed, invLinkspeed, ctMaxFrame, tMaxFrame
+        )
+        results[3, i] = _plenary100Mbit(
+            cmi, idleSlope[i], streamMaxFrame[i], nrInputLinks[i], invLinkspeed, ctMaxFrame, minFrame
+        )
+        results[4, i] = cmi + tMaxFrame
+        results[5, i] = _plenaryFasterMediaV2(
+            cmi, idleSlope[i], streamMaxFrame[i], linkspeed, invLinkspeed, ctMaxFrame, tMaxFrame
+        )
+        results[6, i] = _qStandardL3V2(
+            idleSlope[i], classMaxFrame[i], inputs[::-1], linkspeed, invLinkspeed, ctMaxFrame, tMaxFrame
+        )
+    return results
+
+
+# compile the kernels once at import so the JIT cost is not part of the analysis,
+# the parallel _analyzeAllPorts is only compiled on its first use by runAlgorithmsForPortsBatch
+_qStandardL3V1FanIn(1.0, 1, 2.0, 1.0, 1.0)
+_qStandardL3V2FanIn(1.0, np.zeros(1), 2.0, 1.0, 1.0)
+_qStandardL3V2FanIn(1.0, np.zeros(2)[::-1], 2.0, 1.0, 1.0)
+_plenary100Mbit(1.0, 1.0, 1.0, 1, 0.5, 1.0, 1.0)
+_baStandard(1.0, 1.0, 2.0, 0.5, 0.5, 1.0, 0.5)
+_qStandardL3V1(1.0, 1.0, 1, 2.0, 0.5, 1.0, 0.5)
+_qStandardL3V2(1.0, 1.0, np.zeros(1), 2.0, 0.5, 1.0, 0.5)
+_qStandardL3V2(1.0, 1.0, np.zeros(2)[::-1], 2.0, 0.5, 1.0, 0.5)
+_plenaryFasterMediaV2(1.0, 1.0, 1.0, 2.0, 0.5, 1.0, 0.5)
+
+# source of CBSLatencyCalculator.runAlgorithmsForPortArray and runAlgorithmsForPort
+# with the calculator constants inlined as literals into the calls of the compiled formulas
+_RUN_ALGORITHMS_TEMPLATE = """
+def runAlgorithmsForPortArray(idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes):
+    idleSlope = float(idleSlope)
+    streamMaxFrame = float(streamMaxFrame)
+    classMaxFrame = float(classMaxFrame)
+    nrInputLinks = int(nrInputLinks)
+    inputIdleSlopesSorted = np.sort(np.asarray(inputIdleSlopes, dtype=np.float64))
+    baStandard = _baStandard(
+        idleSlope, streamMaxFrame, {linkspeed!r}, {invLinkspeed!r}, {cmiPerLinkspeed!r}, {ifg!r}, {tMaxFrame!r}
+    )
+    qStandardL3V1 = _qStandardL3V1(
+        idleSlope, classMaxFrame, nrInputLinks, {linkspeed!r}, {invLinkspeed!r}, {ctMaxFrame!r}, {tMaxFrame!r}
+    )
+    qStandardL3V2 = _qStandardL3V2(
+        idleSlope, classMaxFrame, inputIdleSlopesSorted, {linkspeed!r}, {invLinkspeed!r}, {ctMaxFrame!r}, {tMaxFrame!r}
+    )
+    qStandardL3V3 = _qStandardL3V2(
+        idleSlope, classMaxFrame, inputIdleSlopesSorted[::-1], {linkspeed!r}, {invLinkspeed!r}, {ctMaxFrame!r}, {tMaxFrame!r}
+    )
+    plenary100Mbit = _plenary100Mbit(
+        {cmi!r}, idleSlope, streamMaxFrame, nrInputLinks, {invLinkspeed!r}, {ctMaxFrame!r}, {minFrame!r}
+    )
+    plenaryFasterMediaV2 = _plenaryFasterMediaV2(
+        {cmi!r}, idleSlope, streamMaxFrame, {linkspeed!r}, {invLinkspeed!r}, {ctMaxFrame!r}, {tMaxFrame!r}
+    )
+    return np.array(
+        (
+            baStandard,
+            qStandardL3V1,
+            qStandardL3V2,
+            plenary100Mbit,
+            {plenaryFasterMedia!r},
+            plenaryFasterMediaV2,
+            qStandardL3V3,
+        )
+    )
+
+
+def runAlgorithmsForPort(idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes):
+    return dict(
+        zip(
+            RESULT_KEYS,
+            runAlgorithmsForPortArray(
+                idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes
+            ).tolist(),
+        )
+    )
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _compileRunAlgorithms(linkspeed, invLinkspeed, cmi, cmiPerLinkspeed, ifg, ctMaxFrame, minFrame, tMaxFrame):
+    """
+    Generates runAlgorithmsForPortArray and runAlgorithmsForPort for the given constants, see _RUN_ALGORITHMS_TEMPLATE.
+    The functions are cached, calculators with the same constants share them.
+
+    Returns:
+        tuple: The generated runAlgorithmsForPortArray and runAlgorithmsForPort functions.
+    """
+    source = _RUN_ALGORITHMS_TEMPLATE.format(
+        linkspeed=linkspeed,
+        invLinkspeed=invLinkspeed,
+        cmi=cmi,
+        cmiPerLinkspeed=cmiPerLinkspeed,
+        ifg=ifg,
+        ctMaxFrame=ctMaxFrame,
+        minFrame=minFrame,
+        tMaxFrame=tMaxFrame,
+        plenaryFasterMedia=cmi + tMaxFrame,
+    )
+    namespace = {
+        "np": np,
+        "RESULT_KEYS": RESULT_KEYS,
+        "_baStandard": _baStandard,
+        "_qStandardL3V1": _qStandardL3V1,
+        "_qStandardL3V2": _qStandardL3V2,
+        "_plenary100Mbit": _plenary100Mbit,
+        "_plenaryFasterMediaV2": _plenaryFasterMediaV2,
+    }
+    exec(compile(source, "<specialized runAlgorithmsForPort>", "exec"), namespace)
+    return namespace["runAlgorithmsForPortArray"], namespace["runAlgorithmsForPort"]
+
 
 class CBSLatencyCalculator:
     """
@@ -33,6 +310,9 @@ class CBSLatencyCalculator:
         ctMaxFrame: The maximum frame size with interframe gap
     """
 
+    # result of getEmptyResultDict, copied on every call
+    _EMPTY_RESULT_TEMPLATE = dict.fromkeys(RESULT_KEYS, 0)
+
     def __init__(self, linkspeed, cmi, min_packet_bytes=64, max_packet_bytes=1526, ifg_bits=96):
         self.LINKSPEED = linkspeed
         self.CMI = cmi
@@ -44,6 +324,12 @@ class CBSLatencyCalculator:
         self.MAX_PACKET_BITS = max_packet_bytes * 8
         self.MAX_PACKET_BITS_W_IFG = self.MAX_PACKET_BITS + ifg_bits
         self.ctMaxFrame = self.MAX_PACKET_BITS_W_IFG
+        # precomputed invariants of the formulas, divisions by the link speed become multiplications
+        self._invLinkspeed = 1.0 / linkspeed
+        self._tMaxFrame = self.ctMaxFrame * self._invLinkspeed
+        self._cmiPerLinkspeed = cmi * self._invLinkspeed
+        self._plenaryFasterMedia = cmi + self._tMaxFrame
+        self._specializeRunAlgorithms()
 
     def setCMI(self, cmi):
         """
@@ -53,6 +339,46 @@ class CBSLatencyCalculator:
             cmi: The cycle time of the port in seconds
         """
         self.CMI = cmi
+        self._cmiPerLinkspeed = cmi * self._invLinkspeed
+        self._plenaryFasterMedia = cmi + self._tMaxFrame
+        self._specializeRunAlgorithms()
+
+    def withCMI(self, cmi):
+        """
+        Returns a copy of the calculator with a different CMI, the calculator itself is not modified.
+
+        Args:
+            cmi: The cycle time of the port in seconds
+
+        Returns:
+            CBSLatencyCalculator: The copy with the given CMI.
+        """
+        calculator = copy.copy(self)
+        calculator.setCMI(cmi)
+        return calculator
+
+    def _specializeRunAlgorithms(self):
+        """
+        Select the versions of runAlgorithmsForPortArray and runAlgorithmsForPort generated for the current constants.
+        The link speed, CMI and frame sizes are inlined as literals, so each call skips the attribute lookups
+        and method calls of the generic implementation. The generated functions are cached per constants, so setCMI
+        only generates them for new CMIs. Only the constants are stored on the instance, so it can still be pickled.
+        Subclasses keep the generic implementation, as they may override single formulas.
+        """
+        if type(self) is not CBSLatencyCalculator:
+            self._runAlgorithmsKey = None
+            return
+        self._runAlgorithmsKey = (
+            float(self.LINKSPEED),
+            self._invLinkspeed,
+            float(self.CMI),
+            self._cmiPerLinkspeed,
+            float(self.IFG),
+            float(self.ctMaxFrame),
+            float(self.MIN_PACKET_BITS_W_IFG),
+            self._tMaxFrame,
+        )
+        _compileRunAlgorithms(*self._runAlgorithmsKey)
 
     def baStandard(self, idleSlope, streamMaxFrame):
         """
@@ -64,18 +390,19 @@ class CBSLatencyCalculator:
             idleSlope: The idle slope of the port in bits per second
             streamMaxFrame: The maximum frame size of the stream in bits
         """
-        tMaxPacket = self.ctMaxFrame / self.LINKSPEED
-        tStreamPacket = (streamMaxFrame - self.IFG) / self.LINKSPEED  # without IPG
-        delayA = idleSlope * self.CMI / self.LINKSPEED
-        tClassA = (delayA - streamMaxFrame / self.LINKSPEED) * self.LINKSPEED / idleSlope
+        # tClassA = (idleSlope * CMI / LINKSPEED - streamMaxFrame / LINKSPEED) * LINKSPEED / idleSlope
         # tClass can be negative if idleSlope is calculated for a larger interval than CMI (e.g., flow interval)
-        if (
-            tClassA < 0
-        ):  # TODO verify this, ignoring negative values (only happens when idle slope is calculated not according to standards)
-            tClassA = 0
-        # MaxLatency = tDevice + tMaxPacket + tClassA + tStreamPacket
-        MaxLatency = tMaxPacket + tClassA + tStreamPacket
-        return MaxLatency
+        # TODO verify this, ignoring negative values (only happens when idle slope is calculated not according to standards)
+        # MaxLatency = tDevice + tMaxPacket + tClassA + tStreamPacket, with tStreamPacket without IPG
+        return _baStandard(
+            float(idleSlope),
+            float(streamMaxFrame),
+            float(self.LINKSPEED),
+            self._invLinkspeed,
+            self._cmiPerLinkspeed,
+            float(self.IFG),
+            self._tMaxFrame,
+        )
 
     def qStandardL3V1(self, idleSlope, classMaxFrame, nrInputLinks):
         """
@@ -89,26 +416,16 @@ class CBSLatencyCalculator:
             classMaxFrame: The maximum frame size of the class in bits
             nrInputLinks: The number of input links
         """
-        qDelayStand = (
-            self.ctMaxFrame / self.LINKSPEED
-        )  # only one max frame on the way, as we assume we are the highest priority
-        fan_in_data = 0
-        B0 = idleSlope
-        # we assume that the first link has everything
-        for i in range(nrInputLinks):
-            if B0 > 0:
-                Bi = idleSlope
-                W = self.LINKSPEED - max(B0, Bi)
-                fan_in_data += (
-                    self.ctMaxFrame * idleSlope * self.LINKSPEED / (W * self.LINKSPEED)
-                    + classMaxFrame * self.LINKSPEED / W
-                )
-                B0 -= Bi
-            else:
-                fan_in_data += classMaxFrame
-        fan_in_delay = fan_in_data / self.LINKSPEED
-        maxDelayStandard = qDelayStand + fan_in_delay + classMaxFrame / self.LINKSPEED
-        return maxDelayStandard
+        # only one max frame on the way, as we assume we are the highest priority
+        return _qStandardL3V1(
+            float(idleSlope),
+            float(classMaxFrame),
+            int(nrInputLinks),
+            float(self.LINKSPEED),
+            self._invLinkspeed,
+            float(self.ctMaxFrame),
+            self._tMaxFrame,
+        )
 
     def qStandardL3V2(self, idleSlope, classMaxFrame, inputIdleSlopes):
         """
@@ -122,26 +439,19 @@ class CBSLatencyCalculator:
             classMaxFrame: The maximum frame size of the class in bits
             inputIdleSlopes: The incoming idle slopes of the input ports in bits per second
         """
-        queueing_delay = (
-            self.ctMaxFrame / self.LINKSPEED
-        )  # only one max frame on the way, as we assume we are the highest priority
-        fan_in_data = 0
-        B0 = idleSlope
-        for Bi in inputIdleSlopes:
-            if B0 > 0:
-                W = self.LINKSPEED - max(B0, Bi)
-                # fan_in_data += ctMaxFrame * idleSlope * self.LINKSPEED / (W * self.LINKSPEED) + classMaxFrame * self.LINKSPEED / W
-                fan_in_data += (self.ctMaxFrame * idleSlope / W) + (classMaxFrame * self.LINKSPEED / W)
-                B0 -= Bi
-            else:
-                fan_in_data += classMaxFrame
-        fan_in_delay = fan_in_data / self.LINKSPEED
+        # only one max frame on the way, as we assume we are the highest priority
         # permanent_delay = classMaxFrame / self.LINKSPEED # this is not enough!
         # permanent buffer occupancy occurs when bridges are starved and then a burst occurs due to queueing delay (see 3.1.3)
         # Since this kind of event could happen on multiple input ports at the same time, the “permanently buffered” data equals the worst-case fan-in data.
-        permanent_delay = fan_in_delay
-        maxDelayStandard = queueing_delay + fan_in_delay + permanent_delay
-        return maxDelayStandard
+        return _qStandardL3V2(
+            float(idleSlope),
+            float(classMaxFrame),
+            np.asarray(inputIdleSlopes, dtype=np.float64),
+            float(self.LINKSPEED),
+            self._invLinkspeed,
+            float(self.ctMaxFrame),
+            self._tMaxFrame,
+        )
 
     def getMaxReservedPlenary(self, idleSlope):
         """
@@ -165,17 +475,15 @@ class CBSLatencyCalculator:
             streamMaxFrame: The maximum frame size of the stream in bits
             nrInputLinks: The number of input links
         """
-        maxReserved = self.getMaxReservedPlenary(idleSlope)
-        N = min(
-            nrInputLinks - 1,
-            floor((maxReserved - streamMaxFrame) / self.MIN_PACKET_BITS_W_IFG),
+        return _plenary100Mbit(
+            float(self.CMI),
+            float(idleSlope),
+            float(streamMaxFrame),
+            int(nrInputLinks),
+            self._invLinkspeed,
+            float(self.ctMaxFrame),
+            float(self.MIN_PACKET_BITS_W_IFG),
         )
-        otherPackets = 0
-        if N > 0:
-            otherPackets = 2 * (maxReserved - streamMaxFrame) - ceil((maxReserved - streamMaxFrame) / N)
-        qDelayOctets = self.ctMaxFrame + otherPackets + streamMaxFrame
-        qDelay = qDelayOctets / self.LINKSPEED
-        return qDelay
 
     def plenaryFasterMedia(self):
         """
@@ -189,8 +497,8 @@ class CBSLatencyCalculator:
         """
         # maxReserved = self.getMaxReservedPlenary(idleSlope)
         # qDelayFaster = maxReserved / (self.LINKSPEED * idleSlope/self.LINKSPEED) + ctMaxFrame / self.LINKSPEED
-        qDelayFaster = self.CMI + self.ctMaxFrame / self.LINKSPEED
-        return qDelayFaster
+        # qDelayFaster = self.CMI + ctMaxFrame / self.LINKSPEED only depends on the CMI, precomputed in setCMI
+        return self._plenaryFasterMedia
 
     def plenaryFasterMediaV2(self, idleSlope, streamMaxFrame):
         """
@@ -202,30 +510,23 @@ class CBSLatencyCalculator:
             idleSlope: The idle slope of the port in bits per second
             streamMaxFrame: The maximum frame size of the stream in bits
         """
-        maxReserved = self.getMaxReservedPlenary(idleSlope)
-        N = self.LINKSPEED / 100000000  # linkrate_graph / 100Mbps
-        streamBits = ceil((maxReserved - streamMaxFrame) / N)
+        # N = self.LINKSPEED / 100000000  # linkrate_graph / 100Mbps
         # streamBits can be negative if idleSlope is calculated for a larger interval than CMI (e.g., flow interval)
-        if (
-            streamBits < 0
-        ):  # TODO verify this, ignoring negative values (only happens when idle slope is calculated not according to standards)
-            streamBits = 0
-        sendSlope = idleSlope - self.LINKSPEED
-        loCredit = streamBits * sendSlope / self.LINKSPEED
-        hiCredit = self.ctMaxFrame * idleSlope / self.LINKSPEED
-        maxBurstSize = self.LINKSPEED * (loCredit - hiCredit) / sendSlope
-        maxBurstTime = (loCredit - hiCredit) / sendSlope
-        totalBitsQueued = N * maxBurstSize + floor(maxBurstTime / self.CMI) * streamMaxFrame
-        qDelayFasterV2 = (
-            (totalBitsQueued / idleSlope)
-            - (maxBurstTime - (streamBits / self.LINKSPEED))
-            + self.ctMaxFrame / self.LINKSPEED
+        # TODO verify this, ignoring negative values (only happens when idle slope is calculated not according to standards)
+        return _plenaryFasterMediaV2(
+            float(self.CMI),
+            float(idleSlope),
+            float(streamMaxFrame),
+            float(self.LINKSPEED),
+            self._invLinkspeed,
+            float(self.ctMaxFrame),
+            self._tMaxFrame,
         )
-        return qDelayFasterV2
 
     def runAlgorithmsForPort(self, idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes):
         """
         Run all algorithms for a port and return the results as a dictionary
+        Instances of CBSLatencyCalculator call a version specialized for their constants, see _specializeRunAlgorithms.
 
         Args:
             idleSlope: The idle slope of the port in bits per second
@@ -236,7 +537,12 @@ class CBSLatencyCalculator:
         Returns:
             A dictionary containing the results of all algorithms with the algorithm function name as key
         """
-        inputIdleSlopesSorted = sorted(inputIdleSlopes)
+        if self._runAlgorithmsKey is not None:
+            return _compileRunAlgorithms(*self._runAlgorithmsKey)[1](
+                idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes
+            )
+        # sort once, qStandardL3V3 uses a reversed view of the same buffer
+        inputIdleSlopesSorted = np.sort(np.asarray(inputIdleSlopes, dtype=np.float64))
         results = {}
         results["baStandard"] = self.baStandard(idleSlope, streamMaxFrame)
         results["qStandardL3V1"] = self.qStandardL3V1(idleSlope, classMaxFrame, nrInputLinks)
@@ -244,8 +550,155 @@ class CBSLatencyCalculator:
         results["plenary100Mbit"] = self.plenary100Mbit(idleSlope, streamMaxFrame, nrInputLinks)
         results["plenaryFasterMedia"] = self.plenaryFasterMedia()
         results["plenaryFasterMediaV2"] = self.plenaryFasterMediaV2(idleSlope, streamMaxFrame)
-        inputIdleSlopesSorted.reverse()
-        results["qStandardL3V3"] = self.qStandardL3V2(idleSlope, classMaxFrame, inputIdleSlopesSorted)
+        results["qStandardL3V3"] = self.qStandardL3V2(idleSlope, classMaxFrame, inputIdleSlopesSorted[::-1])
+        return results
+
+    def runAlgorithmsForPortArray(self, idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes):
+        """
+        Run all algorithms for a port and return the results as an array
+        Instances of CBSLatencyCalculator call a version specialized for their constants, see _specializeRunAlgorithms.
+
+        Args:
+            idleSlope: The idle slope of the port in bits per second
+            streamMaxFrame: The maximum frame size of the stream in bits
+            nrInputLinks: The number of input links
+            inputIdleSlopes: The incoming idle slopes of the input ports in bits per second
+
+        Returns:
+            An array containing the results of all algorithms in the order of RESULT_KEYS
+        """
+        if self._runAlgorithmsKey is not None:
+            return _compileRunAlgorithms(*self._runAlgorithmsKey)[0](
+                idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes
+            )
+        results = self.runAlgorithmsForPort(idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes)
+        return np.array([results[key] for key in RESULT_KEYS], dtype=np.float64)
+
+    def qStandardL3V2Batch(self, idleSlope, classMaxFrame, inputIdleSlopes, validMask):
+        """
+        Batched version of qStandardL3V2 for N ports at once.
+        The sequential B0 -= Bi recursion is evaluated as an accumulated subtraction along the input axis.
+
+        Args:
+            idleSlope: The idle slopes of the ports in bits per second, shape (N,)
+            classMaxFrame: The maximum frame sizes of the class in bits, shape (N,)
+            inputIdleSlopes: The incoming idle slopes of the input ports in the order to process them, shape (N, K)
+            validMask: Boolean mask marking the valid entries of inputIdleSlopes, shape (N, K)
+
+        Returns:
+            An array of shape (N,) containing the results of qStandardL3V2 for each port
+        """
+        inputIdleSlopes = np.where(validMask, inputIdleSlopes, 0.0)
+        # B0 before processing input i, i.e., idleSlope - B_0 - ... - B_(i-1)
+        B0 = np.subtract.accumulate(np.concatenate((idleSlope[:, None], inputIdleSlopes), axis=1), axis=1)[:, :-1]
+        W = self.LINKSPEED - np.maximum(B0, inputIdleSlopes)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fanIn = (self.ctMaxFrame * idleSlope + classMaxFrame * self.LINKSPEED)[:, None] / W
+        fanIn = np.where(B0 > 0, fanIn, classMaxFrame[:, None])
+        fan_in_data = np.where(validMask, fanIn, 0.0).sum(axis=1)
+        fan_in_delay = fan_in_data * self._invLinkspeed
+        return self._tMaxFrame + fan_in_delay + fan_in_delay
+
+    def runAlgorithmsForPortsBatch(
+        self, idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopesPadded, validMask
+    ):
+        """
+        Run all algorithms for N ports at once and return the results as a dictionary of arrays.
+        Equivalent to calling runAlgorithmsForPort for every port. With numba, the ports are analyzed in parallel by
+        the compiled formulas, otherwise all formulas are evaluated as NumPy array expressions.
+
+        Args:
+            idleSlope: The idle slopes of the ports in bits per second, shape (N,)
+            streamMaxFrame: The maximum frame sizes of the streams in bits, shape (N,)
+            classMaxFrame: The maximum frame sizes of the class in bits, shape (N,) or scalar
+            nrInputLinks: The number of input links of the ports, shape (N,)
+            inputIdleSlopesPadded: The incoming idle slopes of the input ports in bits per second, padded to shape (N, K)
+            validMask: Boolean mask marking the valid entries of inputIdleSlopesPadded, shape (N, K)
+
+        Returns:
+            A dictionary containing arrays of shape (N,) with the results of all algorithms with the algorithm function name as key
+        """
+        idleSlope = np.asarray(idleSlope, dtype=np.float64)
+        streamMaxFrame = np.asarray(streamMaxFrame, dtype=np.float64)
+        classMaxFrame = np.broadcast_to(np.asarray(classMaxFrame, dtype=np.float64), idleSlope.shape)
+        nrInputLinks = np.asarray(nrInputLinks, dtype=np.float64)
+        validMask = np.asarray(validMask, dtype=bool)
+        # sort once, invalid entries are moved to the end of each row and zeroed
+        # qStandardL3V3 uses a reversed view of the same buffer, the zero padding is then at the start of each row
+        inputIdleSlopesSorted = np.sort(np.where(validMask, inputIdleSlopesPadded, np.inf), axis=1)
+        sortedMask = np.arange(validMask.shape[1])[None, :] < validMask.sum(axis=1)[:, None]
+        np.copyto(inputIdleSlopesSorted, 0.0, where=~sortedMask)
+        # the compiled formulas raise on a division by zero, ports with idle slopes outside (0, LINKSPEED)
+        # are evaluated by the NumPy expressions, which propagate inf and nan instead
+        if (
+            NUMBA_AVAILABLE
+            and np.all((idleSlope > 0) & (idleSlope < self.LINKSPEED))
+            and np.all(inputIdleSlopesSorted < self.LINKSPEED)
+        ):
+            allResults = _analyzeAllPorts(
+                idleSlope,
+                streamMaxFrame,
+                np.ascontiguousarray(classMaxFrame),
+                nrInputLinks.astype(np.int64),
+                inputIdleSlopesSorted,
+                sortedMask.sum(axis=1),
+                float(self.LINKSPEED),
+                self._invLinkspeed,
+                float(self.CMI),
+                self._cmiPerLinkspeed,
+                float(self.IFG),
+                float(self.ctMaxFrame),
+                float(self.MIN_PACKET_BITS_W_IFG),
+                self._tMaxFrame,
+            )
+            return dict(zip(RESULT_KEYS, allResults))
+        maxReserved = np.floor(self.CMI * idleSlope)
+        results = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # baStandard
+            tClassA = (
+                (idleSlope * self._cmiPerLinkspeed - streamMaxFrame * self._invLinkspeed) * self.LINKSPEED / idleSlope
+            )
+            np.maximum(tClassA, 0.0, out=tClassA)
+            results["baStandard"] = self._tMaxFrame + tClassA + (streamMaxFrame - self.IFG) * self._invLinkspeed
+            # qStandardL3V1, only the first input link is served while B0 > 0
+            W = self.LINKSPEED - idleSlope
+            firstLink = (
+                self.ctMaxFrame * idleSlope * self.LINKSPEED / (W * self.LINKSPEED) + classMaxFrame * self.LINKSPEED / W
+            )
+            fan_in_data = np.where(
+                (nrInputLinks > 0) & (idleSlope > 0),
+                firstLink + (nrInputLinks - 1) * classMaxFrame,
+                nrInputLinks * classMaxFrame,
+            )
+            results["qStandardL3V1"] = (
+                self._tMaxFrame + fan_in_data * self._invLinkspeed + classMaxFrame * self._invLinkspeed
+            )
+            results["qStandardL3V2"] = self.qStandardL3V2Batch(
+                idleSlope, classMaxFrame, inputIdleSlopesSorted, sortedMask
+            )
+            # plenary100Mbit
+            excess = maxReserved - streamMaxFrame
+            N = np.minimum(nrInputLinks - 1, excess // self.MIN_PACKET_BITS_W_IFG)
+            otherPackets = np.where(N > 0, 2 * excess + (-excess // np.where(N > 0, N, 1)), 0.0)
+            results["plenary100Mbit"] = (self.ctMaxFrame + otherPackets + streamMaxFrame) * self._invLinkspeed
+            results["plenaryFasterMedia"] = np.full(idleSlope.shape, self.plenaryFasterMedia())
+            # plenaryFasterMediaV2
+            N = self.LINKSPEED / 100000000
+            streamBits = np.ceil((maxReserved - streamMaxFrame) / N)
+            np.maximum(streamBits, 0.0, out=streamBits)
+            sendSlope = idleSlope - self.LINKSPEED
+            loCredit = streamBits * sendSlope * self._invLinkspeed
+            hiCredit = self.ctMaxFrame * idleSlope * self._invLinkspeed
+            maxBurstSize = self.LINKSPEED * (loCredit - hiCredit) / sendSlope
+            maxBurstTime = (loCredit - hiCredit) / sendSlope
+            totalBitsQueued = N * maxBurstSize + np.floor(maxBurstTime / self.CMI) * streamMaxFrame
+            results["plenaryFasterMediaV2"] = (
+                (totalBitsQueued / idleSlope) - (maxBurstTime - (streamBits * self._invLinkspeed)) + self._tMaxFrame
+            )
+        results["qStandardL3V3"] = self.qStandardL3V2Batch(
+            idleSlope, classMaxFrame, inputIdleSlopesSorted[:, ::-1], sortedMask[:, ::-1]
+        )
         return results
 
     def getEmptyResultDict(self):
@@ -255,12 +708,13 @@ class CBSLatencyCalculator:
         Returns:
             A dictionary containing the results of all algorithms with the algorithm function name as key
         """
-        return {
-            "baStandard": 0,
-            "qStandardL3V1": 0,
-            "qStandardL3V2": 0,
-            "plenary100Mbit": 0,
-            "plenaryFasterMedia": 0,
-            "plenaryFasterMediaV2": 0,
-            "qStandardL3V3": 0,
-        }
+        return dict(self._EMPTY_RESULT_TEMPLATE)
+
+    def getEmptyResultArray(self):
+        """
+        Get an empty result array with the delay values of all algorithms set to zero
+
+        Returns:
+            An array containing the results of all algorithms in the order of RESULT_KEYS
+        """
+        return np.zeros(len(RESULT_KEYS))
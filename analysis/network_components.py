@@ -11,6 +11,13 @@
 # SPDX-License-Identifier: LGPL-3.0-or-later
 ################################################################################################
 
+import sys
+from collections import deque
+
+import numpy as np
+
+__all__ = ["Flow", "Link", "Path", "Network"]
+
 
 class Flow:
     """
@@ -24,8 +31,11 @@ class Flow:
         deadline (float): The deadline for the flow in seconds.
         period (float): The period of the flow in seconds.
         priority (int): The priority of the flow.
+        sizeBits (int): The size of the flow in bits including the IFG, set when the flow is added to a network.
     """
 
+    __slots__ = ("src", "dst", "size", "deadline", "period", "priority", "sizeBits", "_path")
+
     def __init__(self, src, dst, size, deadline, period, priority):
         self.src = src
         self.dst = dst
@@ -33,25 +43,18 @@ class Flow:
         self.deadline = deadline
         self.period = period
         self.priority = priority
+        self.sizeBits = None
+        # path of the flow in the network, assigned when the flow or its path is added to a network
+        self._path = None
 
     def __str__(self):
         return (
-            "Flow: src: "
-            + str(self.src)
-            + " dst: "
-            + str(self.dst)
-            + " size: "
-            + str(self.size)
-            + " deadline: "
-            + str(self.deadline)
-            + " period: "
-            + str(self.period)
-            + " priority: "
-            + str(self.priority)
+            f"Flow: src: {self.src} dst: {self.dst} size: {self.size} deadline: {self.deadline}"
+            f" period: {self.period} priority: {self.priority}"
         )
 
     def __repr__(self):
-        return self.__str__()
+        return f"Flow({self.src}->{self.dst})"
 
 
 class Link:
@@ -63,15 +66,31 @@ class Link:
         dst (str): The destination node of the link.
         rate (float): The rate of the link in units per second. Currently unused, instead LINKSPEED is used for all links.
         delay (float): The delay of the link in seconds. Currently unused.
-        idleSlope (float): The idle slope of the link.
+        idleSlope (float): The idle slope of the link. Changes are passed on to the network of the link.
     """
 
+    __slots__ = ("src", "dst", "rate", "delay", "_idleSlope", "_endpoints", "_idx", "_network")
+
     def __init__(self, src, dst, rate, delay, idleSlope):
         self.src = src
         self.dst = dst
         self.rate = rate
         self.delay = delay
+        # position in the links of the network and the network, assigned when the link is indexed
+        self._idx = -1
+        self._network = None
         self.idleSlope = idleSlope
+        self._endpoints = (src, dst)
+
+    @property
+    def idleSlope(self):
+        return self._idleSlope
+
+    @idleSlope.setter
+    def idleSlope(self, idleSlope):
+        self._idleSlope = idleSlope
+        if self._network is not None:
+            self._network._linkIdleSlopeChanged(self)
 
     def isLinkFor(self, src, dst, ignoreDirection=False):
         """
@@ -92,20 +111,11 @@ class Link:
 
     def __str__(self):
         return (
-            "Link: src: "
-            + str(self.src)
-            + " dst: "
-            + str(self.dst)
-            + " rate: "
-            + str(self.rate)
-            + " delay: "
-            + str(self.delay)
-            + " idleSlope: "
-            + str(self.idleSlope)
+            f"Link: src: {self.src} dst: {self.dst} rate: {self.rate} delay: {self.delay} idleSlope: {self.idleSlope}"
         )
 
     def __repr__(self):
-        return self.__str__()
+        return f"Link({self.src}->{self.dst})"
 
 
 class Path:
@@ -116,12 +126,18 @@ class Path:
         src (str): The source node of the path.
         dst (str): The destination node of the path.
         links (list): A list of links that make up the path. (must not be necessarily in order)
+            Frozen to a tuple when the path is added to a network.
     """
 
-    def __init__(self, src, dst, links=[]):
+    __slots__ = ("src", "dst", "links", "_linkKeys", "_linkMasks")
+
+    def __init__(self, src, dst, links=None):
         self.src = src
         self.dst = dst
-        self.links = links
+        self.links = [] if links is None else links
+        self._linkKeys = set(l._endpoints for l in self.links)
+        # (network, topology version, links, masks) of the last Network.getPathLinkMasks call
+        self._linkMasks = None
 
     def addLinks(self, link):
         """
@@ -130,21 +146,25 @@ class Path:
         Args:
             link (Link): The link to be added.
         """
-        for l in self.links:
-            if l.isLinkFor(link.src, link.dst):
-                return
-        self.links.append(link)
+        if link._endpoints in self._linkKeys:
+            return
+        self._linkKeys.add(link._endpoints)
+        if isinstance(self.links, tuple):
+            self.links += (link,)
+        else:
+            self.links.append(link)
 
     def __str__(self):
-        return "Path from " + str(self.src) + " to " + str(self.dst) + " via links: " + str(self.links)
+        return f"Path from {self.src} to {self.dst} via links: {self.links}"
 
     def __repr__(self):
-        return self.__str__()
+        return f"Path({self.src}->{self.dst}, {len(self.links)} links)"
 
 
 class Network:
     """
     Represents a network consisting of bridges, nodes, links, flows and paths.
+    Node and bridge names must be strings, they are interned when added to the network.
 
     Attributes:
         bridges (list): A list of bridges in the network.
@@ -155,30 +175,61 @@ class Network:
         IFG (int): The interframe gap in bits.
     """
 
-    def __init__(self, bridges=[], nodes=[], links=[], flows=[], paths=[], IFG=96):
-        self.bridges = bridges
-        self.nodes = nodes
-        self.links = links
-        self.flows = flows
-        self.paths = paths
+    def __init__(self, bridges=None, nodes=None, links=None, flows=None, paths=None, IFG=96):
+        self.bridges = [] if bridges is None else bridges
+        self.nodes = [] if nodes is None else nodes
+        self.links = [] if links is None else links
+        self.flows = [] if flows is None else flows
+        self.paths = [] if paths is None else paths
         self.IFG = IFG
+        # membership indexes, the lists keep the insertion order for iteration
+        self._bridgeSet = set(self.bridges)
+        self._nodeSet = set(self.nodes)
+        self._flowIndex = {}
+        for flow in self.flows:
+            self._flowIndex.setdefault((flow.src, flow.dst), flow)
+        self._pathIndex = {}
+        for path in self.paths:
+            path.links = tuple(path.links)
+            self._pathIndex.setdefault((path.src, path.dst), path)
+        for flow in self.flows:
+            flow.sizeBits = flow.size * 8 + IFG
+            flow._path = self.lookupPath(flow.src, flow.dst)
+        # indexes of the links by their endpoints, kept up to date by addLink
+        self._linkByEndpoints = {}
+        self._outLinks = {}
+        self._inLinks = {}
+        # idle slopes of all links by link index, mirrors Link.idleSlope for vectorized gathers
+        self._idleSlopeArr = np.zeros(max(16, len(self.links)), dtype=np.float64)
+        self._nrIndexedLinks = 0
+        # indices of the input links per link, cleared when links are added
+        self._inputIndexCache = {}
+        # read-only input idle slopes per link, cleared when idle slopes or links change
+        self._inputIdleSlopeCache = {}
+        for link in self.links:
+            self._indexLink(link)
+        # shortest path predecessors per source node, cleared when links are added
+        self._prevCache = {}
+        # endpoints of all links used by a flow, rebuilt on first use after flows or paths changed
+        self._flowLinkSet = None
+        # incremented whenever the topology (nodes, bridges, links, flows, paths) or the idle slopes change,
+        # allows callers to invalidate derived results
+        self._topoVersion = 0
+        self._slopeVersion = 0
+        # result of findClassMaxFrame, reset when flows are added
+        self._classMaxFrame = None
 
     def __str__(self):
         return (
-            "Network: bridges: "
-            + str(self.bridges)
-            + " nodes: "
-            + str(self.nodes)
-            + " links: "
-            + str(self.links)
-            + " flows: "
-            + str(self.flows)
-            + " paths: "
-            + str(self.paths)
+            f"Network: bridges: {self.bridges} nodes: {self.nodes} links: {self.links}"
+            f" flows: {self.flows} paths: {self.paths}"
         )
 
     def __repr__(self):
-        return self.__str__()
+        return (
+            f"Network({len(self.bridges)} bridges, {len(self.nodes)} nodes, {len(self.links)} links,"
+            f" {len(self.flows)} flows, {len(self.paths)} paths)"
+        )
 
     def addBridge(self, bridge):
         """
@@ -187,8 +238,11 @@ class Network:
         Args:
             bridge (str): The bridge to be added.
         """
-        if bridge not in self.bridges:
+        bridge = sys.intern(bridge)
+        if bridge not in self._bridgeSet:
+            self._bridgeSet.add(bridge)
             self.bridges.append(bridge)
+            self._topoVersion += 1
 
     def addNode(self, node):
         """
@@ -197,8 +251,35 @@ class Network:
         Args:
             node (str): The node to be added.
         """
-        if node not in self.nodes:
+        node = sys.intern(node)
+        if node not in self._nodeSet:
+            self._nodeSet.add(node)
             self.nodes.append(node)
+            self._topoVersion += 1
+
+    def isBridge(self, name):
+        """
+        Checks if the specified name is a bridge of the network.
+
+        Args:
+            name (str): The name to check.
+
+        Returns:
+            bool: True if the name is a bridge, False otherwise.
+        """
+        return name in self._bridgeSet
+
+    def isNode(self, name):
+        """
+        Checks if the specified name is a node of the network.
+
+        Args:
+            name (str): The name to check.
+
+        Returns:
+            bool: True if the name is a node, False otherwise.
+        """
+        return name in self._nodeSet
 
     def addBidirectionalLink(self, src, dst, rate, delay, idleSlope=0.0):
         """
@@ -228,9 +309,33 @@ class Network:
             delay (float): The link delay in milliseconds.
             idleSlope (float): The idle slope of the link.
         """
+        src = sys.intern(src)
+        dst = sys.intern(dst)
         if self.getLink(src, dst) is None:
             link = Link(src, dst, rate, delay, idleSlope)
             self.links.append(link)
+            self._indexLink(link)
+            self._prevCache.clear()
+            self._inputIndexCache.clear()
+            self._inputIdleSlopeCache.clear()
+            self._topoVersion += 1
+
+    def _indexLink(self, link):
+        """
+        Adds a link to the endpoint and adjacency indexes.
+
+        Args:
+            link (Link): The link to be indexed.
+        """
+        link._idx = idx = self._nrIndexedLinks
+        link._network = self
+        self._nrIndexedLinks += 1
+        if idx >= self._idleSlopeArr.shape[0]:
+            self._idleSlopeArr = np.concatenate((self._idleSlopeArr, np.zeros_like(self._idleSlopeArr)))
+        self._idleSlopeArr[idx] = link.idleSlope
+        self._linkByEndpoints.setdefault(link._endpoints, link)
+        self._outLinks.setdefault(link.src, []).append(link)
+        self._inLinks.setdefault(link.dst, []).append(link)
 
     def getLink(self, src, dst):
         """
@@ -243,10 +348,7 @@ class Network:
         Returns:
             Link: The link between the two nodes, or None if no link exists.
         """
-        for link in self.links:
-            if link.isLinkFor(src, dst):
-                return link
-        return None
+        return self._linkByEndpoints.get((src, dst))
 
     def calculateShortestPath(self, src, dst):
         """
@@ -263,29 +365,53 @@ class Network:
         path = self.lookupPath(src, dst)
         if path is not None:
             return path
-        # find shortest path with Dijkstra's algorithm
-        unvisited = [src]
-        visited = []
-        distances = {src: 0}
-        previous = {}
-        while unvisited:
-            current = unvisited[0]
-            unvisited.remove(current)
-            visited.append(current)
-            for link in self.links:
-                if link.src == current and link.dst not in visited:
-                    if link.dst not in unvisited:
-                        unvisited.append(link.dst)
-                    if link.dst not in distances:
-                        distances[link.dst] = distances[current] + 1
+        path = self._buildPath(src, dst, self._bfsAllFrom(src))
+        # add path to network for future use
+        self.addPath(path)
+        return path
+
+    def _bfsAllFrom(self, src):
+        """
+        Finds the shortest paths from the source to all reachable nodes.
+        All links count as one hop, so a breadth-first search is sufficient.
+        The result is cached per source node until links are added.
+
+        Args:
+            src (str): The source node.
+
+        Returns:
+            dict: The predecessor of each reachable node on its shortest path from the source.
+        """
+        previous = self._prevCache.get(src)
+        if previous is None:
+            previous = {}
+            queue = deque([src])
+            while queue:
+                current = queue.popleft()
+                for link in self._outLinks.get(current, ()):
+                    if link.dst != src and link.dst not in previous:
                         previous[link.dst] = current
+                        queue.append(link.dst)
+            self._prevCache[src] = previous
+        return previous
+
+    def _buildPath(self, src, dst, previous):
+        """
+        Builds the path from the source to the destination node from the shortest path predecessors.
+
+        Args:
+            src (str): The source node.
+            dst (str): The destination node.
+            previous (dict): The predecessors as returned by _bfsAllFrom(src).
+
+        Returns:
+            Path: The shortest path from the source to the destination node.
+        """
         path = Path(src, dst)
         current = dst
         while current != src:
             path.addLinks(self.getLink(previous[current], current))
             current = previous[current]
-        # add path to network for future use
-        self.addPath(path)
         return path
 
     def lookupPath(self, src, dst):
@@ -299,19 +425,17 @@ class Network:
         Returns:
             Path: The path from the source to the destination node, or None if no path exists.
         """
-        for path in self.paths:
-            if path.src == src and path.dst == dst:
-                return path
-        return None
+        return self._pathIndex.get((src, dst))
 
     def initializeAllPaths(self):
         """
         Initializes all possible paths in the network.
         """
         for src in self.nodes:
+            previous = self._bfsAllFrom(src)
             for dst in self.nodes:
-                if src != dst:
-                    self.calculateShortestPath(src, dst)
+                if src != dst and self.lookupPath(src, dst) is None:
+                    self.addPath(self._buildPath(src, dst, previous))
 
     def addPath(self, path):
         """
@@ -321,7 +445,34 @@ class Network:
             path (Path): The path to be added.
         """
         if self.lookupPath(path.src, path.dst) is None:
+            # the links of registered paths are iterated for every flow, tuples are faster to iterate
+            path.links = tuple(path.links)
             self.paths.append(path)
+            self._pathIndex[(path.src, path.dst)] = path
+            self._flowLinkSet = None
+            flow = self._flowIndex.get((path.src, path.dst))
+            if flow is not None:
+                flow._path = path
+            self._topoVersion += 1
+            self.getPathLinkMasks(path)
+
+    def getPathLinkMasks(self, path):
+        """
+        Gets for every link of the path whether it starts at a bridge and whether it has a queue, i.e. does not start
+        at a node. The masks are cached on the path until the topology of the network or the links of the path change.
+
+        Args:
+            path (Path): The path to get the masks for.
+
+        Returns:
+            tuple: The fromBridge and hasQueue masks as tuples of bools in the order of path.links.
+        """
+        cached = path._linkMasks
+        if cached is None or cached[0] is not self or cached[1] != self._topoVersion or cached[2] is not path.links:
+            fromBridge = tuple(l.src in self._bridgeSet for l in path.links)
+            hasQueue = tuple(l.src not in self._nodeSet for l in path.links)
+            cached = path._linkMasks = (self, self._topoVersion, path.links, (fromBridge, hasQueue))
+        return cached[3]
 
     def addFlow(self, flow):
         """
@@ -330,8 +481,15 @@ class Network:
         Args:
             flow (Flow): The flow to be added.
         """
-        if self.getFlow(flow.src, flow.dst) is None:
+        key = (flow.src, flow.dst)
+        if key not in self._flowIndex:
+            self._flowIndex[key] = flow
             self.flows.append(flow)
+            flow.sizeBits = flow.size * 8 + self.IFG
+            flow._path = self.lookupPath(flow.src, flow.dst)
+            self._flowLinkSet = None
+            self._classMaxFrame = None
+            self._topoVersion += 1
 
     def getFlow(self, src, dst):
         """
@@ -344,10 +502,7 @@ class Network:
         Returns:
             Flow: The flow between the two nodes, or None if no flow exists.
         """
-        for flow in self.flows:
-            if flow.src == src and flow.dst == dst:
-                return flow
-        return None
+        return self._flowIndex.get((src, dst))
 
     def setLinkIdleSlope(self, src, dst, idleSlope):
         """
@@ -367,17 +522,44 @@ class Network:
         (Re-)calculates the idle slopes for all links based on the flows in the network.
         Assumes that all registered flows have the same priority / class.
         """
+        # collect the flows per link once instead of scanning all paths for every link
+        linkFlows = {}
+        for flow in self.flows:
+            for l in flow._path.links:
+                linkFlows.setdefault((l.src, l.dst), []).append(flow)
         for link in self.links:
-            idleSlope = 0
-            for flow in self.flows:
-                path = self.lookupPath(flow.src, flow.dst)
-                for l in path.links:
-                    if l.isLinkFor(link.src, link.dst):
-                        idleSlope += (flow.size * 8 + self.IFG) / cmi
+            idleSlope = sum(flow.sizeBits for flow in linkFlows.get((link.src, link.dst), ())) / cmi
             if idleSlope > link.rate:
                 print("Warning: Idle slope exceeds link speed for link " + str(link) + ".")
             link.idleSlope = idleSlope
 
+    def _linkIdleSlopeChanged(self, link):
+        """
+        Mirrors a changed idle slope of a link of the network and invalidates all results derived from it.
+
+        Args:
+            link (Link): The link with the changed idle slope.
+        """
+        self._idleSlopeArr[link._idx] = link.idleSlope
+        self._idleSlopesChanged()
+
+    def _idleSlopesChanged(self):
+        """
+        Invalidates all results derived from the idle slopes of the links.
+        """
+        self._slopeVersion += 1
+        self._inputIdleSlopeCache.clear()
+
+    def getVersion(self):
+        """
+        Gets the version of the network, which changes whenever the topology or the idle slopes change.
+        Allows callers to invalidate results derived from the network.
+
+        Returns:
+            tuple: The (topology version, idle slope version) of the network.
+        """
+        return (self._topoVersion, self._slopeVersion)
+
     def getInputIdleSlopes(self, link):
         """
         Gets the idle slopes of all input links for the specified link.
@@ -386,14 +568,32 @@ class Network:
             link (Link): The link to check.
 
         Returns:
-            dict: A dictionary containing the idle slopes of all input links.
+            np.ndarray: The idle slopes of all input links, read-only.
         """
-        inputIdleSlopes = []
-        for l in self.links:
-            if l.src != link.dst and l.dst == link.src:
-                inputIdleSlopes.append(l.idleSlope)
+        inputIdleSlopes = self._inputIdleSlopeCache.get(link)
+        if inputIdleSlopes is None:
+            inputIdleSlopes = self._idleSlopeArr[self._getInputIndices(link)]
+            inputIdleSlopes.flags.writeable = False
+            self._inputIdleSlopeCache[link] = inputIdleSlopes
         return inputIdleSlopes
 
+    def _getInputIndices(self, link):
+        """
+        Gets the indices of all input links for the specified link, i.e., all links into its source except the
+        reverse direction of the link itself.
+
+        Args:
+            link (Link): The link to check.
+
+        Returns:
+            np.ndarray: The link indices of all input links.
+        """
+        indices = self._inputIndexCache.get(link)
+        if indices is None:
+            indices = np.array([l._idx for l in self._inLinks.get(link.src, ()) if l.src != link.dst], dtype=np.intp)
+            self._inputIndexCache[link] = indices
+        return indices
+
     def findClassMaxFrame(self):
         """
         Finds the maximum frame size of all flows in the network.
@@ -402,11 +602,25 @@ class Network:
         Returns:
             int: The maximum frame size of all flows in byte in the network.
         """
-        maxFrame = 0
-        for flow in self.flows:
-            if flow.size > maxFrame:
-                maxFrame = flow.size
-        return maxFrame
+        if self._classMaxFrame is None:
+            maxFrame = 0
+            for flow in self.flows:
+                if flow.size > maxFrame:
+                    maxFrame = flow.size
+            self._classMaxFrame = maxFrame
+        return self._classMaxFrame
+
+    def getClassMaxFrameBits(self, ifg=None):
+        """
+        Gets the maximum frame size of all flows in the network in bits including the IFG.
+
+        Args:
+            ifg (int, optional): The interframe gap in bits. Defaults to the IFG of the network.
+
+        Returns:
+            int: The maximum frame size of all flows in bits including the IFG.
+        """
+        return self.findClassMaxFrame() * 8 + (self.IFG if ifg is None else ifg)
 
     def existsFlowOnLink(self, link):
         """
@@ -418,12 +632,18 @@ class Network:
         Returns:
             bool: True if a flow exists on the link, False otherwise.
         """
+        if self._flowLinkSet is None:
+            self._rebuildFlowLinkIndex()
+        return link._endpoints in self._flowLinkSet
+
+    def _rebuildFlowLinkIndex(self):
+        """
+        Collects the endpoints of all links that are used by the path of at least one flow.
+        """
+        self._flowLinkSet = set()
         for flow in self.flows:
-            path = self.findPath(flow.src, flow.dst)
-            for l in path.links:
-                if l.isLinkFor(link.src, link.dst):
-                    return True
-        return False
+            if flow._path is not None:
+                self._flowLinkSet.update(l._endpoints for l in flow._path.links)
 
     def getNumInputLinks(self, link, onlyCountLinksWithFlows=False):
         """
@@ -436,12 +656,11 @@ class Network:
         Returns:
             int: The number of input links for the specified link.
         """
+        if not onlyCountLinksWithFlows:
+            return len(self._getInputIndices(link))
         count = 0
-        for l in self.links:
-            if (
-                l.src != link.dst  # same link but reverse direction so don't count it
-                and l.dst == link.src  # is input link
-                and (not onlyCountLinksWithFlows or self.existsFlowOnLink(l))  # verify only count if it has flows
-            ):
+        for l in self._inLinks.get(link.src, ()):  # is input link
+            # same link but reverse direction so don't count it, verify only count if it has flows
+            if l.src != link.dst and self.existsFlowOnLink(l):
                 count += 1
         return count
@@ -14,14 +14,41 @@
 
 import datetime
 import os
-import sys
 
-modulePath = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-if modulePath not in sys.path:
-    sys.path.append(modulePath)
+import numpy as np
 
-from analysis.network_components import *
-from analysis.latency_calculation_cbs import *
+from analysis.network_components import Network
+from analysis.latency_calculation_cbs import RESULT_KEYS, RESULT_INDEX, CBSLatencyCalculator
+
+__all__ = ["NetworkLatencyAnalysis"]
+
+# queue delays of links starting at a node, shared by all callers
+_ZERO_RESULT = np.zeros(len(RESULT_KEYS))
+_ZERO_RESULT.flags.writeable = False
+
+# minimum number of ports to calculate with CBSLatencyCalculator.runAlgorithmsForPortsBatch,
+# smaller batches do not pay off the start of the parallel analysis
+_MIN_BATCH_PORTS = 64
+
+
+# formats a latency for the CSV file, bound once instead of parsing an f-string format per value
+_formatLatency = "{0:.6f}".format
+
+# source of the functions generated by NetworkLatencyAnalysis.compileStudyKernel,
+# the additional values and the expressions of all columns are filled in per study
+_STUDY_KERNEL_TEMPLATE = """
+def studyKernel(results, additionalValues, timestamp):
+    if {{key for key in resultCols if key in additionalValues}} != additionalCols:
+        raise ValueError("The additional values do not match the additional columns of the study kernel.")
+{additionalValues}
+    lines = []
+    for flow, result in results.items():
+        if isinstance(result, np.ndarray):
+            lines.append(", ".join((timestamp, f"{{flow.src}}-{{flow.dst}}", {arrayColumns})))
+        else:
+            lines.append(", ".join((timestamp, f"{{flow.src}}-{{flow.dst}}", {columns})))
+    return lines
+"""
 
 
 class NetworkLatencyAnalysis:
@@ -61,6 +88,9 @@ class NetworkLatencyAnalysis:
         self.cmi = cmi
         self.switchDelay = switch_delay
         self.ifg = ifg_bits
+        # queue delays per (link, classMaxFrame, streamMaxFrame), valid for the state in _queueCacheState
+        self._queueCache = {}
+        self._queueCacheState = None
 
     def calculateQueueDelayForLink(self, link, flow, classMaxFrame=-1):
         """
@@ -74,20 +104,106 @@ class NetworkLatencyAnalysis:
         Returns:
             dict: A dictionary containing the queue delays for all formulas.
         """
-        if link.src in self.network.nodes:
-            return self.calculator.getEmptyResultDict()
         if classMaxFrame == -1:
-            classMaxFrame = self.network.findClassMaxFrame() * 8 + self.ifg
-        streamMaxFrame = flow.size * 8 + self.ifg
-        inputIdleSlopes = self.network.getInputIdleSlopes(link)
-        nrInputLinks = self.network.getNumInputLinks(link)
-        ## TODO check if we can ignore links that do not have priority flows?
-        # nrInputLinksWSRClass = self.network.getNumInputLinks(link, True)
-        return self.calculator.runAlgorithmsForPort(
-            link.idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes
-        )
+            classMaxFrame = self.network.getClassMaxFrameBits(self.ifg)
+        return self._toResultDict(self._queueDelayForLink(link, flow, classMaxFrame))
+
+    def _queueDelayForLink(self, link, flow, classMaxFrame):
+        """
+        Returns the cached queue delays for the specified link and flow, see calculateQueueDelayForLink.
+        The returned array is read-only and ordered by RESULT_KEYS.
+        """
+        if self.network.isNode(link.src):
+            return _ZERO_RESULT
+        streamMaxFrame = self._getStreamMaxFrame(flow)
+        queueCache = self._getQueueCache()
+        key = (link, classMaxFrame, streamMaxFrame)
+        result = queueCache.get(key)
+        if result is None:
+            inputIdleSlopes = self.network.getInputIdleSlopes(link)
+            nrInputLinks = self.network.getNumInputLinks(link)
+            ## TODO check if we can ignore links that do not have priority flows?
+            # nrInputLinksWSRClass = self.network.getNumInputLinks(link, True)
+            result = self.calculator.runAlgorithmsForPortArray(
+                link.idleSlope, streamMaxFrame, classMaxFrame, nrInputLinks, inputIdleSlopes
+            )
+            result.flags.writeable = False
+            queueCache[key] = result
+        return result
+
+    def _getStreamMaxFrame(self, flow):
+        """
+        Returns the frame size of the flow in bits including the IFG, cached on flows added to the network.
+        """
+        if flow.sizeBits is not None:
+            return flow.sizeBits
+        return flow.size * 8 + self.ifg
+
+    def _getQueueCache(self):
+        """
+        Returns the queue delay cache, cleared if the network, its topology or idle slopes, the calculator or its CMI
+        changed since it was filled.
+        """
+        cacheState = (self.network, self.network.getVersion(), self.calculator, self.calculator.CMI)
+        if cacheState != self._queueCacheState:
+            self._queueCache.clear()
+            self._queueCacheState = cacheState
+        return self._queueCache
+
+    def _calculateQueueDelaysBatch(self, keys):
+        """
+        Calculates the queue delays for multiple links at once and adds them to the queue delay cache.
+
+        Args:
+            keys (list): The (link, classMaxFrame, streamMaxFrame) tuples to calculate the queue delays for.
+
+        Returns:
+            np.ndarray: A read-only array of shape (len(keys), len(RESULT_KEYS)) containing the queue delays.
+        """
+        linkspeed = self.calculator.LINKSPEED
+        idleSlopes = [link.idleSlope for link, _, _ in keys]
+        nrInputLinks = [self.network.getNumInputLinks(link) for link, _, _ in keys]
+        inputIdleSlopes = [self.network.getInputIdleSlopes(link) for link, _, _ in keys]
+        if (
+            len(keys) >= _MIN_BATCH_PORTS
+            and all(0 < idleSlope < linkspeed for idleSlope in idleSlopes)
+            and all(np.all(slopes < linkspeed) for slopes in inputIdleSlopes)
+        ):
+            maxInputs = max(map(len, inputIdleSlopes), default=0)
+            inputIdleSlopesPadded = np.zeros((len(keys), maxInputs))
+            validMask = np.zeros((len(keys), maxInputs), dtype=bool)
+            for i, slopes in enumerate(inputIdleSlopes):
+                inputIdleSlopesPadded[i, : len(slopes)] = slopes
+                validMask[i, : len(slopes)] = True
+            results = self.calculator.runAlgorithmsForPortsBatch(
+                idleSlopes,
+                [streamMaxFrame for _, _, streamMaxFrame in keys],
+                [classMaxFrame for _, classMaxFrame, _ in keys],
+                nrInputLinks,
+                inputIdleSlopesPadded,
+                validMask,
+            )
+            delays = np.stack([results[key] for key in RESULT_KEYS], axis=1)
+        else:
+            # few ports are calculated one by one, also the batched formulas return inf or nan where the per-port
+            # formulas raise a ZeroDivisionError
+            delays = np.array(
+                [
+                    self.calculator.runAlgorithmsForPortArray(
+                        idleSlope, streamMaxFrame, classMaxFrame, nrInputs, slopes
+                    )
+                    for (_, classMaxFrame, streamMaxFrame), idleSlope, nrInputs, slopes in zip(
+                        keys, idleSlopes, nrInputLinks, inputIdleSlopes
+                    )
+                ]
+            )
+        delays.flags.writeable = False
+        queueCache = self._getQueueCache()
+        for key, delay in zip(keys, delays):
+            queueCache[key] = delay
+        return delays
 
-    def calculateEndToEndDelayForFlow(self, flow):
+    def calculateEndToEndDelayForFlow(self, flow, classMaxFrame=-1, path=None):
         """
         Calculates the delay for the specified flow for all formulas.
         Includes queueing, forwarding and transmission delay.
@@ -95,23 +211,43 @@ class NetworkLatencyAnalysis:
 
         Args:
             flow (Flow): The flow to calculate the delay for.
+            classMaxFrame (int, optional): The maximum frame size in bits of all priority flows in the network
+                (should include IFG). Calculated from the flows in the network if not specified.
+            path (Path, optional): The path of the flow. Looked up in the network if not specified.
 
         Returns:
             dict: A dictionary containing the aggregated delay for the flow for all formulas.
         """
-        classMaxFrame = self.network.findClassMaxFrame() * 8 + self.ifg
-        flowDelay = self.calculator.getEmptyResultDict()
-        transmissionDelay = (flow.size * 8 + self.ifg) / self.linkspeed
-        path = self.network.lookupPath(flow.src, flow.dst)
+        if classMaxFrame == -1:
+            classMaxFrame = self.network.getClassMaxFrameBits(self.ifg)
+        if path is None:
+            path = flow._path if flow._path is not None else self.network.lookupPath(flow.src, flow.dst)
+        return self._toResultDict(self._endToEndDelayForFlow(flow, classMaxFrame, path))
+
+    def _endToEndDelayForFlow(self, flow, classMaxFrame, path):
+        """
+        Calculates the delay for the specified flow with precomputed inputs, see calculateEndToEndDelayForFlow.
+        The delays are returned as an array ordered by RESULT_KEYS.
+        """
+        flowDelay = self.calculator.getEmptyResultArray()
+        transmissionDelay = self._getStreamMaxFrame(flow) / self.linkspeed
         if path is not None:
-            for link in path.links:
-                result = self.calculateQueueDelayForLink(link, flow, classMaxFrame)
-                for key in result:
-                    flowDelay[key] = flowDelay[key] + result[key] + transmissionDelay
-                    if link.src in self.network.bridges:
-                        flowDelay[key] += self.switchDelay
+            fromBridge, hasQueue = self.network.getPathLinkMasks(path)
+            for link, linkFromBridge, linkHasQueue in zip(path.links, fromBridge, hasQueue):
+                if linkHasQueue:
+                    flowDelay += self._queueDelayForLink(link, flow, classMaxFrame)
+                flowDelay += transmissionDelay
+                if linkFromBridge:
+                    flowDelay += self.switchDelay
         return flowDelay
 
+    @staticmethod
+    def _toResultDict(result):
+        """
+        Converts a result array ordered by RESULT_KEYS to a dictionary keyed by the formula names.
+        """
+        return dict(zip(RESULT_KEYS, result.tolist()))
+
     def calculateEndToEndDelays(self, useFlowIntervalAsCMI=False):
         """
         Collects the delay for all flows in the network for all formulas.
@@ -122,16 +258,88 @@ class NetworkLatencyAnalysis:
         Returns:
             dict: A dictionary containing the delay for all flows for all formulas.
         """
+        classMaxFrame = self.network.getClassMaxFrameBits(self.ifg)
+        pathByFlow = {flow: flow._path for flow in self.network.flows}
+        if not useFlowIntervalAsCMI:
+            return self._calculateEndToEndDelaysImpl(classMaxFrame, pathByFlow)
+        # the CMI changes with every flow, so there is nothing to batch
         perFlowDelay = dict()
-        for flow in self.network.flows:
-            if useFlowIntervalAsCMI:
-                self.calculator.setCMI(flow.period)
-            perFlowDelay[flow] = self.calculateEndToEndDelayForFlow(flow)
-        if useFlowIntervalAsCMI:
-            # reset CMI to default value
-            self.calculator.setCMI(self.cmi)
+        calculator = self.calculator
+        calculatorByCMI = dict()
+        try:
+            for flow, path in pathByFlow.items():
+                # use a copy per CMI, so the calculator of the analysis keeps its CMI
+                if flow.period not in calculatorByCMI:
+                    calculatorByCMI[flow.period] = calculator.withCMI(flow.period)
+                self.calculator = calculatorByCMI[flow.period]
+                perFlowDelay[flow] = self._toResultDict(self._endToEndDelayForFlow(flow, classMaxFrame, path))
+        finally:
+            self.calculator = calculator
         return perFlowDelay
 
+    def _calculateEndToEndDelaysImpl(self, classMaxFrame, pathByFlow):
+        """
+        Collects the delay for the given flows with the current calculator settings.
+        The queue delays of all (flow, link) pairs that are not cached yet are calculated in one batch.
+
+        Args:
+            classMaxFrame (int): The maximum frame size in bits of all priority flows in the network (should include IFG).
+            pathByFlow (dict): The paths of the flows to calculate the delay for, keyed by flow.
+
+        Returns:
+            dict: A dictionary containing the delay for all given flows for all formulas.
+        """
+        if type(self.calculator) is not CBSLatencyCalculator:
+            # subclasses may override single formulas, which the batched formulas would ignore
+            return {
+                flow: self._toResultDict(self._endToEndDelayForFlow(flow, classMaxFrame, path))
+                for flow, path in pathByFlow.items()
+            }
+        getPathLinkMasks = self.network.getPathLinkMasks
+        flows = list(pathByFlow)
+        pathLinks = [() if pathByFlow[flow] is None else pathByFlow[flow].links for flow in flows]
+        maxLinks = max(map(len, pathLinks), default=0)
+        # per (flow, link on path) the row of the queue delays, row 0 holds zeros for links starting at a node
+        delayRows = [_ZERO_RESULT]
+        rowByKey = {}
+        missingRows = []
+        delayIndex = np.zeros((len(flows), maxLinks), dtype=np.intp)
+        onPath = np.zeros((len(flows), maxLinks), dtype=bool)
+        fromBridge = np.zeros((len(flows), maxLinks), dtype=bool)
+        queueCache = self._getQueueCache()
+        for i, links in enumerate(pathLinks):
+            if not links:
+                continue
+            streamMaxFrame = self._getStreamMaxFrame(flows[i])
+            pathFromBridge, pathHasQueue = getPathLinkMasks(pathByFlow[flows[i]])
+            onPath[i, : len(links)] = True
+            fromBridge[i, : len(links)] = pathFromBridge
+            for j, link in enumerate(links):
+                if not pathHasQueue[j]:
+                    continue
+                key = (link, classMaxFrame, streamMaxFrame)
+                row = rowByKey.get(key)
+                if row is None:
+                    row = rowByKey[key] = len(delayRows)
+                    result = queueCache.get(key)
+                    if result is None:
+                        missingRows.append((row, key))
+                    delayRows.append(result)
+                delayIndex[i, j] = row
+        if missingRows:
+            delays = self._calculateQueueDelaysBatch([key for _, key in missingRows])
+            for (row, _), delay in zip(missingRows, delays):
+                delayRows[row] = delay
+        linkDelays = np.stack(delayRows)[delayIndex]
+        transmissionDelay = np.array([self._getStreamMaxFrame(flow) / self.linkspeed for flow in flows])
+        # accumulate link by link, so the sums are rounded the same way as in _endToEndDelayForFlow
+        flowDelays = np.zeros((len(flows), len(RESULT_KEYS)))
+        for j in range(maxLinks):
+            flowDelays += linkDelays[:, j]
+            flowDelays += np.where(onPath[:, j], transmissionDelay, 0.0)[:, None]
+            flowDelays += np.where(fromBridge[:, j], self.switchDelay, 0.0)[:, None]
+        return {flow: self._toResultDict(flowDelay) for flow, flowDelay in zip(flows, flowDelays)}
+
     def getHeader(self, resultCols):
         """
         Returns the header for the CSV file.
@@ -142,27 +350,64 @@ class NetworkLatencyAnalysis:
         resultHeaderColumns = ", ".join(resultCols)
         return "ExecutionTime, Flow, " + resultHeaderColumns
 
-    def getResultLine(self, result, flow, resultCols, additionalValues=dict()):
+    def getResultLine(self, result, flow, resultCols, additionalValues=dict(), timestamp=None):
         """
         Returns the result line for the CSV file.
 
         Args:
-            result (dict): The result to write to the CSV file.
+            result (dict | np.ndarray): The result to write to the CSV file, arrays are ordered by RESULT_KEYS.
             flow (Flow): The flow to write to the CSV file.
             resultCols (dict): The columns of the results, including columns for additional values.
             additionalValues (dict, optional): Additional values to add to the results. Defaults to dict().
+            timestamp (str, optional): The execution time to write to the CSV file. Defaults to the current time.
 
         Returns:
             str: The result line for the CSV file.
         """
-        resultLine = str(datetime.datetime.now()) + ", " + str(flow.src) + "-" + str(flow.dst)
-        for key in resultCols:
-            resultLine += ", "
-            if key in additionalValues.keys():
-                resultLine += str(additionalValues[key])
-            elif key in result:
-                resultLine += f"{result[key]:.6f}"
-        return resultLine
+        if timestamp is None:
+            timestamp = str(datetime.datetime.now())
+        return self._formatResultLine(result, flow, self._getColumnSpec(resultCols, additionalValues), timestamp)
+
+    def _getColumnSpec(self, resultCols, additionalValues):
+        """
+        Splits the columns into additional values, which are the same for all rows, and result columns.
+
+        Args:
+            resultCols (dict): The columns of the results, including columns for additional values.
+            additionalValues (dict): Additional values to add to the results.
+
+        Returns:
+            list: A (isAdditionalValue, value) tuple per column, with the formatted additional value or the result key.
+        """
+        return [(True, str(additionalValues[key])) if key in additionalValues else (False, key) for key in resultCols]
+
+    def _formatResultLine(self, result, flow, columnSpec, timestamp):
+        """
+        Returns the result line for the CSV file with the columns split by _getColumnSpec, see getResultLine.
+        """
+        isArray = isinstance(result, np.ndarray)
+        columns = [timestamp, f"{flow.src}-{flow.dst}"]
+        for isAdditionalValue, value in columnSpec:
+            if isAdditionalValue:
+                columns.append(value)
+            elif isArray:
+                # result arrays are ordered by RESULT_KEYS
+                columns.append(_formatLatency(result[RESULT_INDEX[value]]) if value in RESULT_INDEX else "")
+            elif value in result:
+                columns.append(_formatLatency(result[value]))
+            else:
+                columns.append("")
+        return ", ".join(columns)
+
+    def resetCsv(self, fileName):
+        """
+        Removes an old CSV file, so the next write starts a new file with a header.
+
+        Args:
+            fileName (str): The name of the CSV file.
+        """
+        if os.path.exists(fileName):
+            os.remove(fileName)
 
     def writeToCsv(self, fileName, results, resultCols, additionalValues=dict()):
         """
@@ -174,12 +419,138 @@ class NetworkLatencyAnalysis:
             resultCols (dict): The columns of the results, including columns for additional values.
             additionalValues (dict, optional): Additional values to add to the results. Defaults to dict().
         """
-        writeHeader = False
-        if not os.path.isfile(fileName):
-            writeHeader = True
-        with open(fileName, "a+") as file:
-            if writeHeader:
-                file.write(self.getHeader(resultCols) + "\n")
+        self.writeRowsToCsv(fileName, [(results, additionalValues)], resultCols)
+
+    def compileStudyKernel(self, resultCols, additionalCols):
+        """
+        Generates a function that formats the CSV lines of a study with fixed columns.
+        Which column holds an additional value or which result is decided once, the generated function formats the
+        columns in straight-line code instead of looking up the kind of every column for every line.
+
+        Args:
+            resultCols (dict): The columns of the results, including columns for additional values.
+            additionalCols (list): The columns for additional values, which must be set for every batch of results.
+
+        Returns:
+            function: A function (results, additionalValues, timestamp) returning the CSV lines of the results as
+                writeToCsv would write them. It raises a ValueError for additional values that do not match
+                additionalCols. Its resultCols attribute holds the columns, see writeRowsToCsv.
+        """
+        additionalValues = []
+        columns = []
+        arrayColumns = []
+        for key in resultCols:
+            if key in additionalCols:
+                additionalValues.append(f"    additional{len(additionalValues)} = str(additionalValues[{key!r}])")
+                columns.append(f"additional{len(additionalValues) - 1}")
+                arrayColumns.append(columns[-1])
+            else:
+                columns.append(f'(formatLatency(result[{key!r}]) if {key!r} in result else "")')
+                # result arrays are ordered by RESULT_KEYS
+                arrayColumns.append(f"formatLatency(result[{RESULT_INDEX[key]}])" if key in RESULT_INDEX else '""')
+        source = _STUDY_KERNEL_TEMPLATE.format(
+            additionalValues="\n".join(additionalValues),
+            columns=", ".join(columns),
+            arrayColumns=", ".join(arrayColumns),
+        )
+        namespace = {
+            "np": np,
+            "formatLatency": _formatLatency,
+            "resultCols": tuple(resultCols),
+            "additionalCols": {key for key in resultCols if key in additionalCols},
+        }
+        exec(compile(source, "<study kernel>", "exec"), namespace)
+        studyKernel = namespace["studyKernel"]
+        studyKernel.resultCols = tuple(resultCols)
+        return studyKernel
+
+    def writeRowsToCsv(self, fileName, rows, resultCols=None, studyKernel=None):
+        """
+        Writes several batches of results to a CSV file at once.
+
+        Args:
+            fileName (str): The name of the CSV file.
+            rows (list): (results, additionalValues) tuples, each as passed to writeToCsv.
+            resultCols (dict, optional): The columns of the results, including columns for additional values.
+                Defaults to the columns of the studyKernel, which it must match if both are given.
+            studyKernel (function, optional): Formats the lines of each batch, see compileStudyKernel.
+                Defaults to the generic formatting of writeToCsv.
+        """
+        if studyKernel is not None:
+            if resultCols is None:
+                resultCols = studyKernel.resultCols
+            elif tuple(resultCols) != studyKernel.resultCols:
+                raise ValueError("The result columns do not match the columns of the study kernel.")
+        # all rows written at once share the execution time
+        timestamp = str(datetime.datetime.now())
+        lines = []
+        for results, additionalValues in rows:
+            if studyKernel is not None:
+                lines.extend(studyKernel(results, additionalValues, timestamp))
+                continue
+            columnSpec = self._getColumnSpec(resultCols, additionalValues)
+            lines.extend(self._formatResultLine(results[flow], flow, columnSpec, timestamp) for flow in results)
+        # build the payload in memory and write it at once, a new or empty file starts with the header
+        with open(fileName, "a") as file:
+            if file.tell() == 0:
+                lines.insert(0, self.getHeader(resultCols))
+            if lines:
+                file.write("\n".join(lines) + "\n")
+
+    def writeToBinary(self, fileName, results, resultCols, additionalValues=dict()):
+        """
+        Writes the results to a compressed NumPy file, a faster alternative to writeToCsv for large studies.
+        See writeRowsToBinary for the content of the file.
+
+        Args:
+            fileName (str): The name of the file, ".npz" is appended if missing.
+            results (dict(dict)): The result rows to write to the file.
+            resultCols (dict): The columns of the results, including columns for additional values.
+            additionalValues (dict, optional): Additional values to add to the results. Defaults to dict().
+        """
+        self.writeRowsToBinary(fileName, [(results, additionalValues)], resultCols)
+
+    def writeRowsToBinary(self, fileName, rows, resultCols):
+        """
+        Writes several batches of results to a compressed NumPy file at once, replacing an existing file.
+        A faster alternative to writeRowsToCsv for large studies.
+
+        The file holds the arrays "flows" with the flow name per row, "columns" with the result columns, "values" with
+        the results per row and NaN for results not calculated, and "additionalColumns" and "additionalValues" with
+        the additional values per row as strings, empty where a batch has no value for a column.
+        Columns that hold an additional value in any batch are additional columns. Load it with np.load(fileName).
+
+        Args:
+            fileName (str): The name of the file, ".npz" is appended if missing.
+            rows (list): (results, additionalValues) tuples, each as passed to writeToBinary.
+            resultCols (dict): The columns of the results, including columns for additional values.
+        """
+        additionalCols = [key for key in resultCols if any(key in additionalValues for _, additionalValues in rows)]
+        valueCols = [key for key in resultCols if key not in additionalCols]
+        # columns of the values and positions in result arrays, which are ordered by RESULT_KEYS
+        arrayCols = [col for col, key in enumerate(valueCols) if key in RESULT_INDEX]
+        arrayIndices = [RESULT_INDEX[valueCols[col]] for col in arrayCols]
+        nrRows = sum(len(results) for results, _ in rows)
+        values = np.full((nrRows, len(valueCols)), np.nan)
+        flows = []
+        additionalRows = []
+        for results, additionalValues in rows:
+            additionalRow = [str(additionalValues[key]) if key in additionalValues else "" for key in additionalCols]
             for flow in results:
-                resultLine = self.getResultLine(results[flow], flow, resultCols, additionalValues)
-                file.write(resultLine + "\n")
+                result = results[flow]
+                if isinstance(result, np.ndarray):
+                    values[len(flows), arrayCols] = result[arrayIndices]
+                else:
+                    for col, key in enumerate(valueCols):
+                        if key in result:
+                            values[len(flows), col] = result[key]
+                flows.append(f"{flow.src}-{flow.dst}")
+                additionalRows.append(additionalRow)
+        np.savez_compressed(
+            fileName,
+            flows=np.array(flows, dtype=str),
+            columns=np.array(valueCols, dtype=str),
+            values=values,
+            additionalColumns=np.array(additionalCols, dtype=str),
+            additionalValues=np.array(additionalRows, dtype=str).reshape(nrRows, len(additionalCols)),
+        )
@@ -17,13 +17,13 @@
 
 import os
 import sys
+from math import floor, ceil
 
 modulePath = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if modulePath not in sys.path:
     sys.path.append(modulePath)
-from analysis.latency_calculation_cbs import *
-from analysis.network_latency_analysis import *
-from analysis.network_components import *
+from analysis.network_latency_analysis import NetworkLatencyAnalysis
+from analysis.network_components import Flow, Path
 
 CMI = 125 * 10 ** (-1 * 6)  # for class A 125 microseconds
 LINK_SPEED = 100000000.0  # 100 Mbit/s
@@ -4561,7 +4561,7 @@ class CBSMaxLatency(NetworkLatencyAnalysis):
         if not calc_end_to_end:
             link = self.network.getLink("aggregateSwitch", "listener")
             queue = "AggregateSwitch-Listener"
-            classMaxFrame = self.network.findClassMaxFrame() * 8 + IFG
+            classMaxFrame = self.network.getClassMaxFrameBits(IFG)
             result[flow] = self.calculateQueueDelayForLink(link, flow, classMaxFrame)
         else:
             result[flow] = self.calculateEndToEndDelayForFlow(flow)
@@ -17,9 +17,8 @@ import sys
 modulePath = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if modulePath not in sys.path:
     sys.path.append(modulePath)
-from analysis.latency_calculation_cbs import *
-from analysis.network_latency_analysis import *
-from analysis.network_components import *
+from analysis.network_latency_analysis import NetworkLatencyAnalysis
+from analysis.network_components import Flow, Path
 
 CMI = 125 * 10 ** (-1 * 6)  # for class A 125 microseconds
 LINK_SPEED = 100000000.0  # 100 Mbit/s
@@ -90,7 +89,7 @@ class SmallEvalNetworkReducedPayload(NetworkLatencyAnalysis):
         self.network.setLinkIdleSlope("S1", "S2", idleSlope)
         self.network.setLinkIdleSlope("S2", "N2", idleSlope)
 
-    def runStudy(self, useFlowIntervalAsCMI=False):
+    def runStudy(self, useFlowIntervalAsCMI=False, writeBinary=False):
 
         idleSlopes = {
             "FixedCMI": 48832000,
@@ -110,8 +109,9 @@ class SmallEvalNetworkReducedPayload(NetworkLatencyAnalysis):
             "plenaryFasterMediaV2",
         ]
         # remove old file
-        if os.path.exists("maxLatenciesSmallEvalNetworkReducedPayload.csv"):
-            os.remove("maxLatenciesSmallEvalNetworkReducedPayload.csv")
+        self.resetCsv("maxLatenciesSmallEvalNetworkReducedPayload.csv")
+        studyKernel = self.compileStudyKernel(resultCols, ["Name", "Idle Slope", "Flow Interval as CMI"])
+        rows = []
         for key in idleSlopes:
             additionalValues = {
                 "Name": key,
@@ -120,7 +120,10 @@ class SmallEvalNetworkReducedPayload(NetworkLatencyAnalysis):
             }
             self.setLinkIdleSlopes(idleSlopes[key])
             results = self.calculateEndToEndDelays()
-            self.writeToCsv("maxLatenciesSmallEvalNetworkReducedPayload.csv", results, resultCols, additionalValues)
+            rows.append((results, additionalValues))
+        self.writeRowsToCsv("maxLatenciesSmallEvalNetworkReducedPayload.csv", rows, studyKernel=studyKernel)
+        if writeBinary:
+            self.writeRowsToBinary("maxLatenciesSmallEvalNetworkReducedPayload.npz", rows, resultCols)
 
 
 ## main function setting up the network and calling the algorithms
@@ -17,12 +17,10 @@
 
 import os
 import sys
-import matplotlib.pyplot as plt
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from analysis.network_latency_analysis import *
-from analysis.network_components import *
-from analysis.latency_calculation_cbs import *
+from analysis.network_latency_analysis import NetworkLatencyAnalysis
+from analysis.network_components import Flow, Path
 
 CMI = 125 * 10 ** (-1 * 6)  # for class A 125 microseconds
 LINK_SPEED = 100000000.0  # 100 Mbit/s
@@ -116,8 +114,7 @@ class ExceedLatencyLvl0(NetworkLatencyAnalysis):
 
     def runStudy(self):
         filename = "maxLatenciesExceedLatencyLvl0.csv"
-        if os.path.exists(filename):
-            os.remove(filename)
+        self.resetCsv(filename)
 
         self.setLinkIdleSlopes(50000000)
         results = self.calculateEndToEndDelays()
@@ -132,7 +129,7 @@ class ExceedLatencyLvl0(NetworkLatencyAnalysis):
         }
         self.writeToCsv(filename, results, resultCols, additionalValues)
 
-        classMaxFrame = self.network.findClassMaxFrame() * 8 + IFG
+        classMaxFrame = self.network.getClassMaxFrameBits(IFG)
         flow = self.network.getFlow("GenFoi", "SinkFinal")
 
         resultS1 = dict()